@@ -0,0 +1,25 @@
+-- Restore product child tables without cascading deletes.
+CREATE TABLE product_benchmark_old (
+    product_id INTEGER NOT NULL REFERENCES products(id),
+    benchmark_id INTEGER NOT NULL REFERENCES benchmarks(id),
+    distance FLOAT NOT NULL DEFAULT 0.0,
+    PRIMARY KEY (product_id, benchmark_id)
+);
+
+INSERT INTO product_benchmark_old (product_id, benchmark_id, distance)
+SELECT product_id, benchmark_id, distance FROM product_benchmark;
+
+DROP TABLE product_benchmark;
+ALTER TABLE product_benchmark_old RENAME TO product_benchmark;
+
+CREATE TABLE product_images_old (
+    id INTEGER NOT NULL PRIMARY KEY,
+    product_id INTEGER NOT NULL REFERENCES products(id),
+    url TEXT NOT NULL
+);
+
+INSERT INTO product_images_old (id, product_id, url)
+SELECT id, product_id, url FROM product_images;
+
+DROP TABLE product_images;
+ALTER TABLE product_images_old RENAME TO product_images;
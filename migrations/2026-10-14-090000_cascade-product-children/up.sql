@@ -0,0 +1,32 @@
+-- Rebuild product child tables so deleting a product removes its
+-- benchmark associations and images in the same statement.
+CREATE TABLE product_benchmark_new (
+    product_id INTEGER NOT NULL REFERENCES products(id) ON DELETE CASCADE,
+    benchmark_id INTEGER NOT NULL REFERENCES benchmarks(id),
+    distance FLOAT NOT NULL DEFAULT 0.0,
+    PRIMARY KEY (product_id, benchmark_id)
+);
+
+-- Orphaned rows cannot satisfy the foreign keys and are dropped.
+INSERT INTO product_benchmark_new (product_id, benchmark_id, distance)
+SELECT product_id, benchmark_id, distance
+FROM product_benchmark
+WHERE product_id IN (SELECT id FROM products)
+  AND benchmark_id IN (SELECT id FROM benchmarks);
+
+DROP TABLE product_benchmark;
+ALTER TABLE product_benchmark_new RENAME TO product_benchmark;
+
+CREATE TABLE product_images_new (
+    id INTEGER NOT NULL PRIMARY KEY,
+    product_id INTEGER NOT NULL REFERENCES products(id) ON DELETE CASCADE,
+    url TEXT NOT NULL
+);
+
+INSERT INTO product_images_new (id, product_id, url)
+SELECT id, product_id, url
+FROM product_images
+WHERE product_id IN (SELECT id FROM products);
+
+DROP TABLE product_images;
+ALTER TABLE product_images_new RENAME TO product_images;
@@ -0,0 +1,2 @@
+DROP INDEX IF EXISTS idx_product_benchmark_benchmark_id;
+DROP INDEX IF EXISTS idx_product_images_product_id;
@@ -0,0 +1,4 @@
+-- product_benchmark(product_id) is already the primary key prefix and
+-- products(crawler_id) is the prefix of the url and sku indexes.
+CREATE INDEX IF NOT EXISTS idx_product_benchmark_benchmark_id ON product_benchmark(benchmark_id);
+CREATE INDEX IF NOT EXISTS idx_product_images_product_id ON product_images(product_id);
@@ -39,11 +39,15 @@ fn trim_and_require_non_empty<S: Into<String>>(
     value: S,
     field: &'static str,
 ) -> Result<String, TypeConstraintError> {
-    let trimmed = value.into().trim().to_string();
+    let value = value.into();
+    let trimmed = value.trim();
     if trimmed.is_empty() {
         Err(TypeConstraintError::EmptyString(field))
+    } else if trimmed.len() == value.len() {
+        // Already trimmed: keep the caller's allocation.
+        Ok(value)
     } else {
-        Ok(trimmed)
+        Ok(trimmed.to_string())
     }
 }
 
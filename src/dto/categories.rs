@@ -11,7 +11,7 @@ impl From<Category> for CategoryDto {
     fn from(value: Category) -> Self {
         Self {
             id: value.id.get(),
-            name: value.name.as_str().to_string(),
+            name: value.name.into_inner(),
         }
     }
 }
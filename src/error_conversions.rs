@@ -8,9 +8,7 @@ use pushkind_common::repository::errors::RepositoryError;
 use pushkind_common::services::errors::ServiceError;
 
 use crate::domain::types::TypeConstraintError;
-use crate::forms::benchmarks::{
-    AddBenchmarkFormError, AssociateFormError, UnassociateFormError, UploadBenchmarksFormError,
-};
+use crate::forms::benchmarks::{AddBenchmarkFormError, AssociateFormError, UnassociateFormError};
 
 impl From<TypeConstraintError> for ServiceError {
     fn from(val: TypeConstraintError) -> Self {
@@ -24,12 +22,6 @@ impl From<TypeConstraintError> for RepositoryError {
     }
 }
 
-impl From<UploadBenchmarksFormError> for ServiceError {
-    fn from(val: UploadBenchmarksFormError) -> Self {
-        ServiceError::Form(val.to_string())
-    }
-}
-
 impl From<AddBenchmarkFormError> for ServiceError {
     fn from(val: AddBenchmarkFormError) -> Self {
         ServiceError::Form(val.to_string())
@@ -1,6 +1,3 @@
-use std::io::Read;
-
-use actix_multipart::form::{MultipartForm, tempfile::TempFile};
 use chrono::Utc;
 use serde::Deserialize;
 use thiserror::Error;
@@ -118,118 +115,6 @@ impl TryFrom<AddBenchmarkForm> for AddBenchmarkFormPayload {
     }
 }
 
-/// Multipart form for uploading a CSV file with multiple benchmarks.
-#[derive(MultipartForm, Validate)]
-pub struct UploadBenchmarksForm {
-    /// Uploaded CSV file containing benchmark rows.
-    #[multipart(limit = "10MB")]
-    pub csv: TempFile,
-}
-
-/// Strongly-typed payload built from [`UploadBenchmarksForm`].
-#[derive(Debug, Clone, PartialEq)]
-pub struct UploadBenchmarksFormPayload {
-    pub benchmarks: Vec<AddBenchmarkFormPayload>,
-}
-
-impl UploadBenchmarksFormPayload {
-    /// Construct [`NewBenchmark`] domain models with contextual hub information.
-    pub fn into_new_benchmarks(self, hub_id: HubId) -> Vec<NewBenchmark> {
-        self.benchmarks
-            .into_iter()
-            .map(|benchmark| benchmark.into_new_benchmark(hub_id))
-            .collect()
-    }
-}
-
-/// Errors that can occur while processing a [`UploadBenchmarksForm`].
-#[derive(Debug, Error)]
-pub enum UploadBenchmarksFormError {
-    #[error("Upload benchmarks form validation failed: {0}")]
-    Validation(String),
-    /// Wrapper for I/O errors when reading the uploaded file.
-    #[error("Error reading csv file")]
-    FileReadError,
-    /// The CSV content could not be parsed into benchmark records.
-    #[error("Error parsing csv file")]
-    CsvParseError,
-    /// Parsed data violated domain type constraints.
-    #[error("Invalid benchmark data: {0}")]
-    TypeConstraint(String),
-}
-
-impl From<ValidationErrors> for UploadBenchmarksFormError {
-    fn from(value: ValidationErrors) -> Self {
-        UploadBenchmarksFormError::Validation(value.to_string())
-    }
-}
-
-impl From<std::io::Error> for UploadBenchmarksFormError {
-    fn from(_: std::io::Error) -> Self {
-        UploadBenchmarksFormError::FileReadError
-    }
-}
-
-impl From<csv::Error> for UploadBenchmarksFormError {
-    fn from(_: csv::Error) -> Self {
-        UploadBenchmarksFormError::CsvParseError
-    }
-}
-
-impl From<TypeConstraintError> for UploadBenchmarksFormError {
-    fn from(value: TypeConstraintError) -> Self {
-        UploadBenchmarksFormError::TypeConstraint(value.to_string())
-    }
-}
-
-#[derive(Debug, Deserialize)]
-struct CsvBenchmarkRow {
-    pub name: String,
-    pub sku: String,
-    pub category: String,
-    pub units: String,
-    pub price: f64,
-    pub amount: f64,
-    pub description: String,
-}
-
-impl TryFrom<&mut UploadBenchmarksForm> for UploadBenchmarksFormPayload {
-    type Error = UploadBenchmarksFormError;
-
-    fn try_from(value: &mut UploadBenchmarksForm) -> Result<Self, Self::Error> {
-        value.validate()?;
-
-        let mut csv_content = String::new();
-        value.csv.file.read_to_string(&mut csv_content)?;
-
-        let mut rdr = csv::Reader::from_reader(csv_content.as_bytes());
-        let mut benchmarks = Vec::new();
-
-        for result in rdr.deserialize::<CsvBenchmarkRow>() {
-            let row = result?;
-            benchmarks.push(AddBenchmarkFormPayload::new(
-                row.name,
-                row.sku,
-                row.category,
-                row.units,
-                row.price,
-                row.amount,
-                row.description,
-            )?);
-        }
-
-        Ok(Self { benchmarks })
-    }
-}
-
-impl TryFrom<UploadBenchmarksForm> for UploadBenchmarksFormPayload {
-    type Error = UploadBenchmarksFormError;
-
-    fn try_from(mut value: UploadBenchmarksForm) -> Result<Self, Self::Error> {
-        (&mut value).try_into()
-    }
-}
-
 /// Form used to remove a benchmark association from a product.
 #[derive(Deserialize, Validate)]
 pub struct UnassociateForm {
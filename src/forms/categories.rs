@@ -12,7 +12,8 @@ fn normalize_category_path(value: String) -> Result<String, TypeConstraintError>
         return Err(TypeConstraintError::EmptyString("category"));
     }
 
-    let mut normalized_parts = Vec::new();
+    // Segments are non-empty, so a non-empty buffer means a separator is due.
+    let mut normalized = String::with_capacity(trimmed.len());
     for part in trimmed.split('/') {
         let part = part.trim();
         if part.is_empty() {
@@ -20,10 +21,13 @@ fn normalize_category_path(value: String) -> Result<String, TypeConstraintError>
                 "category path contains empty segments".to_string(),
             ));
         }
-        normalized_parts.push(part);
+        if !normalized.is_empty() {
+            normalized.push('/');
+        }
+        normalized.push_str(part);
     }
 
-    Ok(normalized_parts.join("/"))
+    Ok(normalized)
 }
 
 #[derive(Deserialize, Validate)]
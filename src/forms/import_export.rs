@@ -1,5 +1,5 @@
 use std::collections::{HashMap, HashSet};
-use std::io::{Read, Seek, SeekFrom};
+use std::io::{Seek, SeekFrom};
 
 use actix_multipart::form::{MultipartForm, tempfile::TempFile, text::Text};
 use calamine::{Data, Reader, open_workbook_auto};
@@ -42,10 +42,13 @@ impl TryFrom<&str> for UploadFormat {
     type Error = UploadParseError;
 
     fn try_from(value: &str) -> Result<Self, Self::Error> {
-        match value.trim().to_ascii_lowercase().as_str() {
-            "csv" => Ok(Self::Csv),
-            "xlsx" => Ok(Self::Xlsx),
-            other => Err(UploadParseError::InvalidFormat(other.to_string())),
+        let value = value.trim();
+        if value.eq_ignore_ascii_case("csv") {
+            Ok(Self::Csv)
+        } else if value.eq_ignore_ascii_case("xlsx") {
+            Ok(Self::Xlsx)
+        } else {
+            Err(UploadParseError::InvalidFormat(value.to_ascii_lowercase()))
         }
     }
 }
@@ -60,10 +63,13 @@ impl TryFrom<&str> for UploadMode {
     type Error = UploadParseError;
 
     fn try_from(value: &str) -> Result<Self, Self::Error> {
-        match value.trim().to_ascii_lowercase().as_str() {
-            "full" => Ok(Self::Full),
-            "partial" => Ok(Self::Partial),
-            other => Err(UploadParseError::InvalidMode(other.to_string())),
+        let value = value.trim();
+        if value.eq_ignore_ascii_case("full") {
+            Ok(Self::Full)
+        } else if value.eq_ignore_ascii_case("partial") {
+            Ok(Self::Partial)
+        } else {
+            Err(UploadParseError::InvalidMode(value.to_ascii_lowercase()))
         }
     }
 }
@@ -121,8 +127,12 @@ impl From<std::io::Error> for UploadParseError {
 }
 
 impl From<csv::Error> for UploadParseError {
-    fn from(_: csv::Error) -> Self {
-        Self::CsvParseFailed
+    fn from(err: csv::Error) -> Self {
+        // The reader wraps the temp file, so I/O failures surface as `csv::Error`.
+        match err.kind() {
+            csv::ErrorKind::Io(_) => Self::ReadFailed,
+            _ => Self::CsvParseFailed,
+        }
     }
 }
 
@@ -248,6 +258,13 @@ fn validate_headers(
     Ok(())
 }
 
+/// Case-insensitive suffix check that does not lowercase a copy of the name.
+fn has_extension(file_name: &str, extension: &str) -> bool {
+    let name = file_name.as_bytes();
+    name.len() >= extension.len()
+        && name[name.len() - extension.len()..].eq_ignore_ascii_case(extension.as_bytes())
+}
+
 fn validate_file_meta(
     form: &UploadImportForm,
     format: UploadFormat,
@@ -257,8 +274,8 @@ fn validate_file_meta(
     };
 
     let extension_ok = match format {
-        UploadFormat::Csv => file_name.to_ascii_lowercase().ends_with(".csv"),
-        UploadFormat::Xlsx => file_name.to_ascii_lowercase().ends_with(".xlsx"),
+        UploadFormat::Csv => has_extension(file_name, ".csv"),
+        UploadFormat::Xlsx => has_extension(file_name, ".xlsx"),
     };
 
     if !extension_ok {
@@ -291,12 +308,11 @@ fn parse_csv_rows(
     let file = form.file.file.as_file_mut();
     file.seek(SeekFrom::Start(0))?;
 
-    let mut content = String::new();
-    file.read_to_string(&mut content)?;
-
+    // Parse straight from the temp file; the CSV reader buffers internally, so
+    // there is no need to copy the whole upload into a `String` first.
     let mut reader = csv::ReaderBuilder::new()
         .trim(csv::Trim::None)
-        .from_reader(content.as_bytes());
+        .from_reader(file);
 
     let headers = reader
         .headers()?
@@ -348,8 +364,25 @@ fn cell_to_string(cell: &Data) -> String {
 
 #[cfg(test)]
 mod tests {
+    use std::io::Write;
+
     use super::*;
 
+    fn csv_form(content: &[u8]) -> UploadImportForm {
+        let mut file = tempfile::NamedTempFile::new().unwrap();
+        file.write_all(content).unwrap();
+        UploadImportForm {
+            file: TempFile {
+                file,
+                content_type: None,
+                file_name: Some("upload.csv".to_string()),
+                size: content.len(),
+            },
+            format: Text("csv".to_string()),
+            mode: Text("partial".to_string()),
+        }
+    }
+
     #[test]
     fn validates_full_mode_exact_headers_products() {
         let headers = vec![
@@ -417,4 +450,45 @@ mod tests {
             .to_string();
         assert!(err.contains("exact headers"));
     }
+
+    #[test]
+    fn parses_format_mode_and_extension_case_insensitively() {
+        assert_eq!(
+            UploadFormat::try_from(" XLSX ").unwrap(),
+            UploadFormat::Xlsx
+        );
+        assert_eq!(
+            UploadMode::try_from("Partial").unwrap(),
+            UploadMode::Partial
+        );
+        assert!(has_extension("Прайс.CSV", ".csv"));
+        assert!(!has_extension("csv", ".csv"));
+    }
+
+    #[test]
+    fn parses_csv_rows_from_temp_file() {
+        let mut form = csv_form(b"sku,price\nA-1,10.5\n");
+
+        let (headers, rows) = parse_csv_rows(&mut form).unwrap();
+        assert_eq!(headers, vec!["sku", "price"]);
+        assert_eq!(rows, vec![vec!["A-1".to_string(), "10.5".to_string()]]);
+    }
+
+    #[test]
+    fn reports_invalid_utf8_csv_as_parse_failure() {
+        let mut form = csv_form(b"sku,price\nA-\xff,10.5\n");
+
+        let err = parse_csv_rows(&mut form).unwrap_err();
+        assert!(matches!(err, UploadParseError::CsvParseFailed));
+    }
+
+    #[test]
+    fn maps_csv_io_errors_to_read_failure() {
+        let err = csv::Error::from(std::io::Error::other("disk gone"));
+
+        assert!(matches!(
+            UploadParseError::from(err),
+            UploadParseError::ReadFailed
+        ));
+    }
 }
@@ -12,8 +12,18 @@ use actix_identity::IdentityMiddleware;
 #[cfg(feature = "server")]
 use actix_session::{SessionMiddleware, storage::CookieSessionStore};
 #[cfg(feature = "server")]
+use actix_web::body::MessageBody;
+#[cfg(feature = "server")]
 use actix_web::cookie::Key;
 #[cfg(feature = "server")]
+use actix_web::dev::{ServiceRequest, ServiceResponse};
+#[cfg(feature = "server")]
+use actix_web::http::StatusCode;
+#[cfg(feature = "server")]
+use actix_web::http::header::{CACHE_CONTROL, HeaderValue};
+#[cfg(feature = "server")]
+use actix_web::middleware::Next;
+#[cfg(feature = "server")]
 use actix_web::{App, HttpServer, middleware, web};
 #[cfg(feature = "server")]
 use actix_web_flash_messages::{FlashMessagesFramework, storage::CookieMessageStore};
@@ -76,6 +86,28 @@ pub mod services;
 #[cfg(feature = "server")]
 pub const SERVICE_ACCESS_ROLE: &str = "parser";
 
+/// Marks successful `/assets` responses as cacheable for a day.
+///
+/// Assets are not fingerprinted, so after a deploy browsers may keep serving a
+/// cached copy for up to a day before revalidating with the ETag actix-files
+/// sends. Error responses such as a 404 for a missing file get no header, so
+/// shared caches do not keep them.
+#[cfg(feature = "server")]
+async fn cache_assets(
+    req: ServiceRequest,
+    next: Next<impl MessageBody>,
+) -> Result<ServiceResponse<impl MessageBody>, actix_web::Error> {
+    let mut res = next.call(req).await?;
+    let status = res.status();
+    if status.is_success() || status == StatusCode::NOT_MODIFIED {
+        res.headers_mut().insert(
+            CACHE_CONTROL,
+            HeaderValue::from_static("public, max-age=86400"),
+        );
+    }
+    Ok(res)
+}
+
 #[cfg(feature = "server")]
 pub async fn run(server_config: ServerConfig) -> std::io::Result<()> {
     let common_config = CommonServerConfig {
@@ -121,7 +153,11 @@ pub async fn run(server_config: ServerConfig) -> std::io::Result<()> {
             )
             .wrap(middleware::Compress::default())
             .wrap(middleware::Logger::default())
-            .service(Files::new("/assets", "./assets"))
+            .service(
+                web::scope("/assets")
+                    .wrap(middleware::from_fn(cache_assets))
+                    .service(Files::new("", "./assets")),
+            )
             .service(not_assigned)
             .service(web::scope("/api").service(api_v1_products))
             .service(
@@ -161,3 +197,44 @@ pub async fn run(server_config: ServerConfig) -> std::io::Result<()> {
     .run()
     .await
 }
+
+#[cfg(all(test, feature = "server"))]
+mod tests {
+    use actix_web::test;
+
+    use super::*;
+
+    #[actix_web::test]
+    async fn asset_cache_header_is_only_set_on_successful_responses() {
+        let app = test::init_service(
+            App::new().service(
+                web::scope("/assets")
+                    .wrap(middleware::from_fn(cache_assets))
+                    .service(Files::new("", "./assets")),
+            ),
+        )
+        .await;
+
+        let found = test::call_service(
+            &app,
+            test::TestRequest::get()
+                .uri("/assets/placeholder.png")
+                .to_request(),
+        )
+        .await;
+        assert_eq!(
+            found.headers().get(CACHE_CONTROL).unwrap(),
+            "public, max-age=86400"
+        );
+
+        let missing = test::call_service(
+            &app,
+            test::TestRequest::get()
+                .uri("/assets/missing.css")
+                .to_request(),
+        )
+        .await;
+        assert_eq!(missing.status(), StatusCode::NOT_FOUND);
+        assert!(missing.headers().get(CACHE_CONTROL).is_none());
+    }
+}
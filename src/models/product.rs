@@ -30,8 +30,12 @@ pub struct Product {
 }
 
 /// Insertable/patchable form of [`Product`].
+///
+/// `None` is written as `NULL` rather than `DEFAULT` so that batches of rows
+/// can be inserted with a single multi-row statement on SQLite.
 #[derive(Debug, Insertable, AsChangeset)]
 #[diesel(table_name = crate::schema::products)]
+#[diesel(treat_none_as_default_value = false)]
 pub struct NewProduct {
     pub crawler_id: i32,
     pub name: String,
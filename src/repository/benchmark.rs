@@ -4,7 +4,10 @@ use pushkind_common::repository::errors::RepositoryResult;
 use crate::domain::benchmark::{Benchmark, NewBenchmark};
 use crate::domain::types::{BenchmarkId, BenchmarkSku, HubId, ProductId, SimilarityDistance};
 use crate::models::benchmark::{Benchmark as DbBenchmark, NewBenchmark as DbNewBenchmark};
-use crate::repository::{BenchmarkListQuery, BenchmarkReader, BenchmarkWriter, DieselRepository};
+use crate::repository::{
+    BenchmarkListQuery, BenchmarkReader, BenchmarkWriter, DieselRepository, INSERT_BATCH_SIZE,
+    list_total,
+};
 
 impl BenchmarkReader for DieselRepository {
     fn get_benchmark_by_id(
@@ -40,8 +43,6 @@ impl BenchmarkReader for DieselRepository {
                 .into_boxed::<diesel::sqlite::Sqlite>()
         };
 
-        let total = query_builder().count().get_result::<i64>(&mut conn)? as usize;
-
         let mut items = query_builder();
 
         // Apply pagination if requested
@@ -59,6 +60,10 @@ impl BenchmarkReader for DieselRepository {
             .map(TryInto::try_into)
             .collect::<Result<Vec<Benchmark>, _>>()?;
 
+        let total = list_total(query.pagination.as_ref(), items.len(), || {
+            query_builder().count().get_result(&mut conn)
+        })?;
+
         Ok((total, items))
     }
 
@@ -93,36 +98,49 @@ impl BenchmarkWriter for DieselRepository {
             .map(|benchmark| benchmark.into())
             .collect::<Vec<DbNewBenchmark>>();
 
-        let affected = diesel::insert_into(benchmarks::table)
-            .values(&db_benchmarks)
-            .execute(&mut conn)?;
+        // Bounded multi-row inserts so large uploads stay under SQLite's
+        // parameter limit, committed as one transaction.
+        let affected = conn.transaction(|conn| {
+            let mut affected = 0;
+            for chunk in db_benchmarks.chunks(INSERT_BATCH_SIZE) {
+                affected += diesel::insert_into(benchmarks::table)
+                    .values(chunk)
+                    .execute(conn)?;
+            }
+            Ok::<usize, diesel::result::Error>(affected)
+        })?;
 
         Ok(affected)
     }
 
-    fn update_benchmark(
+    fn update_benchmarks(
         &self,
-        benchmark_id: BenchmarkId,
-        benchmark: &NewBenchmark,
+        benchmarks: &[(BenchmarkId, NewBenchmark)],
     ) -> RepositoryResult<usize> {
         use crate::schema::benchmarks;
 
         let mut conn = self.conn()?;
-        let db_benchmark: DbNewBenchmark = benchmark.into();
-
-        let affected =
-            diesel::update(benchmarks::table.filter(benchmarks::id.eq(benchmark_id.get())))
-                .set((
-                    benchmarks::name.eq(db_benchmark.name),
-                    benchmarks::sku.eq(db_benchmark.sku),
-                    benchmarks::category.eq(db_benchmark.category),
-                    benchmarks::units.eq(db_benchmark.units),
-                    benchmarks::price.eq(db_benchmark.price),
-                    benchmarks::amount.eq(db_benchmark.amount),
-                    benchmarks::description.eq(db_benchmark.description),
-                    benchmarks::updated_at.eq(db_benchmark.updated_at),
-                ))
-                .execute(&mut conn)?;
+
+        let affected = conn.transaction(|conn| {
+            let mut affected = 0;
+            for (benchmark_id, benchmark) in benchmarks {
+                let db_benchmark: DbNewBenchmark = benchmark.into();
+                affected +=
+                    diesel::update(benchmarks::table.filter(benchmarks::id.eq(benchmark_id.get())))
+                        .set((
+                            benchmarks::name.eq(db_benchmark.name),
+                            benchmarks::sku.eq(db_benchmark.sku),
+                            benchmarks::category.eq(db_benchmark.category),
+                            benchmarks::units.eq(db_benchmark.units),
+                            benchmarks::price.eq(db_benchmark.price),
+                            benchmarks::amount.eq(db_benchmark.amount),
+                            benchmarks::description.eq(db_benchmark.description),
+                            benchmarks::updated_at.eq(db_benchmark.updated_at),
+                        ))
+                        .execute(conn)?;
+            }
+            Ok::<usize, diesel::result::Error>(affected)
+        })?;
 
         Ok(affected)
     }
@@ -4,7 +4,9 @@ use pushkind_common::repository::errors::RepositoryResult;
 use crate::domain::category::{Category, NewCategory};
 use crate::domain::types::{CategoryAssignmentSource, CategoryId, CategoryName, HubId};
 use crate::models::category::{Category as DbCategory, NewCategory as DbNewCategory};
-use crate::repository::{CategoryListQuery, CategoryReader, CategoryWriter, DieselRepository};
+use crate::repository::{
+    CategoryListQuery, CategoryReader, CategoryWriter, DieselRepository, list_total,
+};
 
 impl CategoryReader for DieselRepository {
     fn list_categories(
@@ -21,8 +23,6 @@ impl CategoryReader for DieselRepository {
                 .into_boxed::<diesel::sqlite::Sqlite>()
         };
 
-        let total = query_builder().count().get_result::<i64>(&mut conn)? as usize;
-
         let mut items = query_builder();
         if let Some(pagination) = &query.pagination {
             let offset = ((pagination.page.max(1) - 1) * pagination.per_page) as i64;
@@ -37,6 +37,10 @@ impl CategoryReader for DieselRepository {
             .map(TryInto::try_into)
             .collect::<Result<Vec<Category>, _>>()?;
 
+        let total = list_total(query.pagination.as_ref(), items.len(), || {
+            query_builder().count().get_result(&mut conn)
+        })?;
+
         Ok((total, items))
     }
 
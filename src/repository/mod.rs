@@ -10,7 +10,7 @@ use crate::domain::crawler::Crawler;
 use crate::domain::product::{NewProduct, Product};
 use crate::domain::types::{
     BenchmarkId, BenchmarkSku, CategoryId, CategoryName, CrawlerId, HubId, ProductId, ProductSku,
-    SimilarityDistance,
+    ProductUrl, SimilarityDistance,
 };
 
 pub mod benchmark;
@@ -21,6 +21,30 @@ pub mod product;
 #[cfg(test)]
 pub mod test;
 
+/// Maximum number of rows written by a single multi-row `INSERT`.
+///
+/// Keeps the bound parameter count per statement well below SQLite's limit.
+const INSERT_BATCH_SIZE: usize = 500;
+
+/// Derives the total for a paginated list from the rows just loaded.
+///
+/// `count` only runs when the page cannot tell on its own: when it is full,
+/// or when it is empty past the first page.
+fn list_total(
+    pagination: Option<&Pagination>,
+    loaded: usize,
+    count: impl FnOnce() -> diesel::QueryResult<i64>,
+) -> diesel::QueryResult<usize> {
+    let Some(pagination) = pagination else {
+        return Ok(loaded);
+    };
+    let offset = (pagination.page.max(1) - 1) * pagination.per_page;
+    if (offset == 0 || loaded > 0) && loaded < pagination.per_page {
+        return Ok(offset + loaded);
+    }
+    Ok(count()? as usize)
+}
+
 /// Repository implementation backed by Diesel and SQLite.
 ///
 /// The underlying `r2d2::Pool` is cheap to clone, allowing the repository to
@@ -143,13 +167,27 @@ pub trait ProcessingStateReader {
 /// Read-only operations for product entities.
 pub trait ProductReader {
     /// List products matching the supplied query parameters.
+    ///
+    /// The embedding blob is not loaded: every returned product has
+    /// `embedding: None`, whatever is stored. Use
+    /// [`ProductReader::get_product_by_id`] when the embedding is needed.
     fn list_products(&self, query: ProductListQuery) -> RepositoryResult<(usize, Vec<Product>)>;
+    /// List non-null URLs of the products matching the query, without loading the products.
+    fn list_product_urls(&self, query: ProductListQuery) -> RepositoryResult<Vec<ProductUrl>>;
+    /// Same as [`Self::list_product_urls`] but grouped by owning crawler in one query.
+    fn list_product_urls_by_crawler(
+        &self,
+        query: ProductListQuery,
+    ) -> RepositoryResult<HashMap<CrawlerId, Vec<ProductUrl>>>;
     /// Return a mapping of product identifiers to similarity distances for a benchmark.
     fn list_distances(
         &self,
         benchmark_id: BenchmarkId,
     ) -> RepositoryResult<HashMap<ProductId, SimilarityDistance>>;
     /// Perform a full-text search for products.
+    ///
+    /// Like [`ProductReader::list_products`], results never carry the stored
+    /// embedding (`embedding` is always `None`).
     fn search_products(&self, query: ProductListQuery) -> RepositoryResult<(usize, Vec<Product>)>;
     /// Retrieve a product by its identifier.
     fn get_product_by_id(&self, id: ProductId) -> RepositoryResult<Option<Product>>;
@@ -162,14 +200,10 @@ pub trait ProductReader {
 }
 
 pub trait ProductWriter {
-    /// Persist a new product.
-    fn create_product(&self, product: &NewProduct) -> RepositoryResult<usize>;
-    /// Update an existing product and invalidate obsolete embedding.
-    fn update_product(
-        &self,
-        product_id: ProductId,
-        product: &NewProduct,
-    ) -> RepositoryResult<usize>;
+    /// Persist new product records in a single transaction.
+    fn create_products(&self, products: &[NewProduct]) -> RepositoryResult<usize>;
+    /// Update existing products in a single transaction and invalidate obsolete embeddings.
+    fn update_products(&self, products: &[(ProductId, NewProduct)]) -> RepositoryResult<usize>;
     /// Set a manual category assignment for a product.
     fn set_product_category_manual(
         &self,
@@ -232,13 +266,12 @@ pub trait BenchmarkReader {
 
 /// Write operations for benchmark entities and their associations.
 pub trait BenchmarkWriter {
-    /// Persist new benchmark records.
+    /// Persist new benchmark records in a single transaction.
     fn create_benchmark(&self, benchmarks: &[NewBenchmark]) -> RepositoryResult<usize>;
-    /// Update an existing benchmark row.
-    fn update_benchmark(
+    /// Update existing benchmark rows in a single transaction.
+    fn update_benchmarks(
         &self,
-        benchmark_id: BenchmarkId,
-        benchmark: &NewBenchmark,
+        benchmarks: &[(BenchmarkId, NewBenchmark)],
     ) -> RepositoryResult<usize>;
     /// Remove an association between a benchmark and a product.
     fn remove_benchmark_association(
@@ -2,16 +2,18 @@ use std::collections::HashMap;
 
 use chrono::Utc;
 use diesel::prelude::*;
-use diesel::sql_types::{BigInt, Integer, Text};
+use diesel::sql_types::{BigInt, Binary, Integer, Nullable, Text};
 use pushkind_common::repository::errors::RepositoryResult;
 
 use crate::domain::product::{NewProduct, Product};
 use crate::domain::types::{
-    BenchmarkId, CategoryAssignmentSource, CategoryId, CategoryName, ImageUrl, ProductId,
-    ProductSku, SimilarityDistance,
+    BenchmarkId, CategoryAssignmentSource, CategoryId, CategoryName, CrawlerId, ImageUrl,
+    ProductId, ProductSku, ProductUrl, SimilarityDistance,
 };
 use crate::models::product::{NewProduct as DbNewProduct, Product as DbProduct};
-use crate::repository::{DieselRepository, ProductListQuery, ProductReader, ProductWriter};
+use crate::repository::{
+    DieselRepository, INSERT_BATCH_SIZE, ProductListQuery, ProductReader, ProductWriter, list_total,
+};
 
 /// Helper struct used to capture the result of a `COUNT(*)` query.
 #[derive(QueryableByName)]
@@ -26,10 +28,13 @@ fn hydrate_associated_categories(
 ) -> RepositoryResult<()> {
     use crate::schema::categories;
 
-    let category_ids: Vec<i32> = products
+    // Pages usually share a handful of categories; query each id once.
+    let mut category_ids: Vec<i32> = products
         .iter()
         .filter_map(|product| product.category_id.map(|id| id.get()))
         .collect();
+    category_ids.sort_unstable();
+    category_ids.dedup();
 
     if category_ids.is_empty() {
         return Ok(());
@@ -40,7 +45,10 @@ fn hydrate_associated_categories(
         .select((categories::id, categories::name))
         .load::<(i32, String)>(conn)?;
 
-    let names = category_rows.into_iter().collect::<HashMap<i32, String>>();
+    let names = category_rows
+        .into_iter()
+        .map(|(id, name)| Ok((id, CategoryName::new(name)?)))
+        .collect::<RepositoryResult<HashMap<i32, CategoryName>>>()?;
 
     for product in products {
         let Some(category_id) = product.category_id else {
@@ -49,12 +57,47 @@ fn hydrate_associated_categories(
         let Some(name) = names.get(&category_id.get()) else {
             continue;
         };
-        product.associated_category = Some(CategoryName::new(name.clone())?);
+        product.associated_category = Some(name.clone());
     }
 
     Ok(())
 }
 
+/// Products query with the crawler, benchmark and hub filters of `query` applied.
+fn filtered_products(
+    query: &ProductListQuery,
+) -> crate::schema::products::BoxedQuery<'static, diesel::sqlite::Sqlite> {
+    use crate::schema::{crawlers, product_benchmark, products};
+
+    let mut items = products::table.into_boxed::<diesel::sqlite::Sqlite>();
+
+    if let Some(crawler_id) = query.crawler_id {
+        items = items.filter(products::crawler_id.eq(crawler_id.get()));
+    }
+
+    if let Some(benchmark_id) = query.benchmark_id {
+        items = items.filter(
+            products::id.eq_any(
+                product_benchmark::table
+                    .filter(product_benchmark::benchmark_id.eq(benchmark_id.get()))
+                    .select(product_benchmark::product_id),
+            ),
+        );
+    }
+
+    if let Some(hub_id) = query.hub_id {
+        items = items.filter(
+            products::crawler_id.eq_any(
+                crawlers::table
+                    .filter(crawlers::hub_id.eq(hub_id.get()))
+                    .select(crawlers::id),
+            ),
+        );
+    }
+
+    items
+}
+
 impl ProductReader for DieselRepository {
     fn get_product_by_id(&self, id: ProductId) -> RepositoryResult<Option<Product>> {
         use crate::schema::{product_images, products};
@@ -133,59 +176,49 @@ impl ProductReader for DieselRepository {
     }
 
     fn list_products(&self, query: ProductListQuery) -> RepositoryResult<(usize, Vec<Product>)> {
-        use crate::schema::{crawlers, product_benchmark, product_images, products};
+        use crate::schema::{product_images, products};
 
         let mut conn = self.conn()?;
 
-        let query_builder = || {
-            let mut items = products::table.into_boxed::<diesel::sqlite::Sqlite>();
-
-            if let Some(crawler_id) = query.crawler_id {
-                items = items.filter(products::crawler_id.eq(crawler_id.get()));
-            }
-
-            if let Some(benchmark_id) = query.benchmark_id {
-                items = items.filter(
-                    products::id.eq_any(
-                        product_benchmark::table
-                            .filter(product_benchmark::benchmark_id.eq(benchmark_id.get()))
-                            .select(product_benchmark::product_id),
-                    ),
-                );
-            }
-
-            if let Some(hub_id) = query.hub_id {
-                items = items.filter(
-                    products::crawler_id.eq_any(
-                        crawlers::table
-                            .filter(crawlers::hub_id.eq(hub_id.get()))
-                            .select(crawlers::id),
-                    ),
-                );
-            }
-
-            items
-        };
-
-        let total = query_builder().count().get_result::<i64>(&mut conn)? as usize;
-
-        let mut items = query_builder();
+        let mut items = filtered_products(&query);
 
         // Apply pagination if requested
         if let Some(pagination) = &query.pagination {
-            let offset = ((pagination.page.max(1) - 1) * pagination.per_page) as i64;
-            let limit = pagination.per_page as i64;
-            items = items.offset(offset).limit(limit);
+            let offset = (pagination.page.max(1) - 1) * pagination.per_page;
+            items = items
+                .offset(offset as i64)
+                .limit(pagination.per_page as i64);
         }
 
-        // Final load
+        // Final load; list views never read the embedding, so skip the blob.
         let mut items = items
+            .select((
+                products::id,
+                products::crawler_id,
+                products::name,
+                products::sku,
+                products::category,
+                products::units,
+                products::price,
+                products::amount,
+                products::description,
+                products::url,
+                products::created_at,
+                products::updated_at,
+                None::<Vec<u8>>.into_sql::<Nullable<Binary>>(),
+                products::category_id,
+                products::category_assignment_source,
+            ))
             .order(products::name.asc())
             .load::<DbProduct>(&mut conn)?
             .into_iter()
             .map(TryInto::try_into)
             .collect::<Result<Vec<Product>, _>>()?;
 
+        let total = list_total(query.pagination.as_ref(), items.len(), || {
+            filtered_products(&query).count().get_result(&mut conn)
+        })?;
+
         hydrate_associated_categories(&mut conn, &mut items)?;
 
         if !items.is_empty() {
@@ -214,6 +247,50 @@ impl ProductReader for DieselRepository {
         Ok((total, items))
     }
 
+    fn list_product_urls(&self, query: ProductListQuery) -> RepositoryResult<Vec<ProductUrl>> {
+        use crate::schema::products;
+
+        let mut conn = self.conn()?;
+
+        // Only the url column is loaded; no rows, categories or images.
+        let urls = filtered_products(&query)
+            .filter(products::url.is_not_null())
+            .select(products::url)
+            .load::<Option<String>>(&mut conn)?;
+
+        Ok(urls
+            .into_iter()
+            .flatten()
+            .map(ProductUrl::new)
+            .collect::<Result<Vec<_>, _>>()?)
+    }
+
+    fn list_product_urls_by_crawler(
+        &self,
+        query: ProductListQuery,
+    ) -> RepositoryResult<HashMap<CrawlerId, Vec<ProductUrl>>> {
+        use crate::schema::products;
+
+        let mut conn = self.conn()?;
+
+        let rows = filtered_products(&query)
+            .filter(products::url.is_not_null())
+            .select((products::crawler_id, products::url))
+            .load::<(i32, Option<String>)>(&mut conn)?;
+
+        let mut urls: HashMap<CrawlerId, Vec<ProductUrl>> = HashMap::new();
+        for (crawler_id, url) in rows {
+            let Some(url) = url else {
+                continue;
+            };
+            urls.entry(CrawlerId::new(crawler_id)?)
+                .or_default()
+                .push(ProductUrl::new(url)?);
+        }
+
+        Ok(urls)
+    }
+
     fn search_products(&self, query: ProductListQuery) -> RepositoryResult<(usize, Vec<Product>)> {
         let mut conn = self.conn()?;
 
@@ -227,10 +304,13 @@ impl ProductReader for DieselRepository {
             }
         };
 
-        // Build base SQL
+        // Build base SQL; the embedding blob is not needed by search results.
         let mut sql = String::from(
             r#"
-            SELECT products.*
+            SELECT products.id, products.crawler_id, products.name, products.sku,
+                products.category, products.units, products.price, products.amount,
+                products.description, products.url, products.created_at, products.updated_at,
+                NULL AS embedding, products.category_id, products.category_assignment_source
             FROM products
             JOIN products_fts ON products.id = products_fts.rowid
             WHERE products_fts MATCH ?
@@ -319,44 +399,58 @@ impl ProductReader for DieselRepository {
     }
 }
 impl ProductWriter for DieselRepository {
-    fn create_product(&self, product: &NewProduct) -> RepositoryResult<usize> {
+    fn create_products(&self, products: &[NewProduct]) -> RepositoryResult<usize> {
         use crate::schema::products;
 
         let mut conn = self.conn()?;
-        let db_product = DbNewProduct::from(product);
-
-        let affected = diesel::insert_into(products::table)
-            .values(&db_product)
-            .execute(&mut conn)?;
+        let db_products = products
+            .iter()
+            .map(DbNewProduct::from)
+            .collect::<Vec<DbNewProduct>>();
+
+        // Multi-row inserts in bounded chunks, committed together.
+        let affected = conn.transaction(|conn| {
+            let mut affected = 0;
+            for chunk in db_products.chunks(INSERT_BATCH_SIZE) {
+                affected += diesel::insert_into(products::table)
+                    .values(chunk)
+                    .execute(conn)?;
+            }
+            Ok::<usize, diesel::result::Error>(affected)
+        })?;
 
         Ok(affected)
     }
 
-    fn update_product(
-        &self,
-        product_id: ProductId,
-        product: &NewProduct,
-    ) -> RepositoryResult<usize> {
+    fn update_products(&self, products: &[(ProductId, NewProduct)]) -> RepositoryResult<usize> {
         use crate::schema::products;
 
         let mut conn = self.conn()?;
-        let db_product = DbNewProduct::from(product);
         let now = Utc::now().naive_utc();
 
-        let affected = diesel::update(products::table.filter(products::id.eq(product_id.get())))
-            .set((
-                products::name.eq(db_product.name),
-                products::sku.eq(db_product.sku),
-                products::category.eq(db_product.category),
-                products::units.eq(db_product.units),
-                products::price.eq(db_product.price),
-                products::amount.eq(db_product.amount),
-                products::description.eq(db_product.description),
-                products::url.eq(db_product.url),
-                products::embedding.eq::<Option<Vec<u8>>>(None),
-                products::updated_at.eq(now),
-            ))
-            .execute(&mut conn)?;
+        // One commit for the whole batch instead of one per row.
+        let affected = conn.transaction(|conn| {
+            let mut affected = 0;
+            for (product_id, product) in products {
+                let db_product = DbNewProduct::from(product);
+                affected +=
+                    diesel::update(products::table.filter(products::id.eq(product_id.get())))
+                        .set((
+                            products::name.eq(db_product.name),
+                            products::sku.eq(db_product.sku),
+                            products::category.eq(db_product.category),
+                            products::units.eq(db_product.units),
+                            products::price.eq(db_product.price),
+                            products::amount.eq(db_product.amount),
+                            products::description.eq(db_product.description),
+                            products::url.eq(db_product.url),
+                            products::embedding.eq::<Option<Vec<u8>>>(None),
+                            products::updated_at.eq(now),
+                        ))
+                        .execute(conn)?;
+            }
+            Ok::<usize, diesel::result::Error>(affected)
+        })?;
 
         Ok(affected)
     }
@@ -1,3 +1,4 @@
+use std::cell::RefCell;
 use std::collections::HashMap;
 
 use pushkind_common::repository::errors::RepositoryResult;
@@ -7,7 +8,7 @@ use crate::domain::category::Category;
 use crate::domain::product::NewProduct;
 use crate::domain::types::{
     BenchmarkId, BenchmarkSku, CategoryId, CategoryName, CrawlerId, HubId, ProductId, ProductSku,
-    SimilarityDistance,
+    ProductUrl, SimilarityDistance,
 };
 use crate::domain::{benchmark::Benchmark, crawler::Crawler, product::Product};
 use crate::repository::{
@@ -23,6 +24,8 @@ pub struct TestRepository {
     products: Vec<Product>,
     benchmarks: Vec<Benchmark>,
     categories: Vec<Category>,
+    product_writes: RefCell<Vec<usize>>,
+    benchmark_writes: RefCell<Vec<usize>>,
 }
 
 impl TestRepository {
@@ -32,6 +35,8 @@ impl TestRepository {
             products,
             benchmarks,
             categories: vec![],
+            product_writes: RefCell::default(),
+            benchmark_writes: RefCell::default(),
         }
     }
 
@@ -40,6 +45,18 @@ impl TestRepository {
         self
     }
 
+    /// Batch sizes passed to `create_products` and `update_products`, in call
+    /// order.
+    pub fn product_writes(&self) -> Vec<usize> {
+        self.product_writes.borrow().clone()
+    }
+
+    /// Batch sizes passed to `create_benchmark` and `update_benchmarks`, in
+    /// call order.
+    pub fn benchmark_writes(&self) -> Vec<usize> {
+        self.benchmark_writes.borrow().clone()
+    }
+
     fn clone_crawler(c: &Crawler) -> Crawler {
         c.clone()
     }
@@ -55,6 +72,18 @@ impl TestRepository {
     fn clone_category(c: &Category) -> Category {
         c.clone()
     }
+
+    /// Hub scoping goes through the owning crawler, as in `DieselRepository`.
+    ///
+    /// Benchmark filters are not applied: the in-memory store keeps no
+    /// product-benchmark links.
+    fn in_hub(&self, product: &Product, hub_id: Option<HubId>) -> bool {
+        hub_id.is_none_or(|hub_id| {
+            self.crawlers
+                .get(&product.crawler_id)
+                .is_some_and(|crawler| crawler.hub_id == hub_id)
+        })
+    }
 }
 
 impl CrawlerReader for TestRepository {
@@ -106,6 +135,34 @@ impl ProductReader for TestRepository {
         Ok((total, items))
     }
 
+    fn list_product_urls(&self, query: ProductListQuery) -> RepositoryResult<Vec<ProductUrl>> {
+        let hub_id = query.hub_id;
+        let (_total, items) = self.list_products(query)?;
+        Ok(items
+            .into_iter()
+            .filter(|p| self.in_hub(p, hub_id))
+            .filter_map(|p| p.url)
+            .collect())
+    }
+
+    fn list_product_urls_by_crawler(
+        &self,
+        query: ProductListQuery,
+    ) -> RepositoryResult<HashMap<CrawlerId, Vec<ProductUrl>>> {
+        let hub_id = query.hub_id;
+        let (_total, items) = self.list_products(query)?;
+        let mut urls: HashMap<CrawlerId, Vec<ProductUrl>> = HashMap::new();
+        for product in items {
+            if !self.in_hub(&product, hub_id) {
+                continue;
+            }
+            if let Some(url) = product.url {
+                urls.entry(product.crawler_id).or_default().push(url);
+            }
+        }
+        Ok(urls)
+    }
+
     fn list_distances(
         &self,
         _benchmark_id: BenchmarkId,
@@ -149,16 +206,14 @@ impl ProductReader for TestRepository {
 }
 
 impl ProductWriter for TestRepository {
-    fn create_product(&self, _product: &NewProduct) -> RepositoryResult<usize> {
-        Ok(1)
+    fn create_products(&self, products: &[NewProduct]) -> RepositoryResult<usize> {
+        self.product_writes.borrow_mut().push(products.len());
+        Ok(products.len())
     }
 
-    fn update_product(
-        &self,
-        _product_id: ProductId,
-        _product: &NewProduct,
-    ) -> RepositoryResult<usize> {
-        Ok(1)
+    fn update_products(&self, products: &[(ProductId, NewProduct)]) -> RepositoryResult<usize> {
+        self.product_writes.borrow_mut().push(products.len());
+        Ok(products.len())
     }
 
     fn set_product_category_manual(
@@ -213,15 +268,16 @@ impl BenchmarkReader for TestRepository {
 
 impl BenchmarkWriter for TestRepository {
     fn create_benchmark(&self, benchmarks: &[NewBenchmark]) -> RepositoryResult<usize> {
+        self.benchmark_writes.borrow_mut().push(benchmarks.len());
         Ok(benchmarks.len())
     }
 
-    fn update_benchmark(
+    fn update_benchmarks(
         &self,
-        _benchmark_id: BenchmarkId,
-        _benchmark: &NewBenchmark,
+        benchmarks: &[(BenchmarkId, NewBenchmark)],
     ) -> RepositoryResult<usize> {
-        Ok(1)
+        self.benchmark_writes.borrow_mut().push(benchmarks.len());
+        Ok(benchmarks.len())
     }
 
     fn remove_benchmark_association(
@@ -177,7 +177,20 @@ pub async fn upload_benchmarks(
     tera: web::Data<Tera>,
     MultipartForm(mut form): MultipartForm<UploadImportForm>,
 ) -> impl Responder {
-    match upload_benchmarks_import_service(&mut form, &user, repo.get_ref()) {
+    let upload_repo = repo.clone();
+    let (user, result) = match web::block(move || {
+        let result = upload_benchmarks_import_service(&mut form, &user, upload_repo.get_ref());
+        (user, result)
+    })
+    .await
+    {
+        Ok(outcome) => outcome,
+        Err(err) => {
+            log::error!("Failed to run benchmarks upload: {err}");
+            return HttpResponse::InternalServerError().finish();
+        }
+    };
+    match result {
         Ok(report) => {
             if report.errors.is_empty() {
                 FlashMessage::success(format!(
@@ -234,7 +247,17 @@ pub async fn download_benchmarks(
     user: AuthenticatedUser,
     repo: web::Data<DieselRepository>,
 ) -> impl Responder {
-    match download_benchmarks_service(&params.format, &user, repo.get_ref()) {
+    let format = params.into_inner().format;
+    let result =
+        match web::block(move || download_benchmarks_service(&format, &user, repo.get_ref())).await
+        {
+            Ok(result) => result,
+            Err(err) => {
+                log::error!("Failed to run benchmarks download: {err}");
+                return HttpResponse::InternalServerError().finish();
+            }
+        };
+    match result {
         Ok(file) => HttpResponse::Ok()
             .append_header(("Content-Type", file.content_type))
             .append_header((
@@ -114,6 +114,10 @@ pub async fn crawl_crawler(
             FlashMessage::error("Парсер не существует").send();
             redirect("/")
         }
+        Err(ServiceError::Form(message)) => {
+            FlashMessage::error(message).send();
+            redirect("/")
+        }
         Err(err) => {
             log::error!("Failed to start crawler crawl: {err}");
             HttpResponse::InternalServerError().finish()
@@ -149,6 +153,10 @@ pub async fn update_crawler_prices(
             FlashMessage::error("Парсер не существует").send();
             redirect("/")
         }
+        Err(ServiceError::Form(message)) => {
+            FlashMessage::error(message).send();
+            redirect("/")
+        }
         Err(err) => {
             log::error!("Failed to update crawler prices: {err}");
             HttpResponse::InternalServerError().finish()
@@ -167,7 +175,21 @@ pub async fn upload_crawler_products(
     MultipartForm(mut form): MultipartForm<UploadImportForm>,
 ) -> impl Responder {
     let crawler_id = crawler_id.into_inner();
-    match upload_crawler_products_service(crawler_id, &mut form, &user, repo.get_ref()) {
+    let upload_repo = repo.clone();
+    let (user, result) = match web::block(move || {
+        let result =
+            upload_crawler_products_service(crawler_id, &mut form, &user, upload_repo.get_ref());
+        (user, result)
+    })
+    .await
+    {
+        Ok(outcome) => outcome,
+        Err(err) => {
+            log::error!("Failed to run crawler products upload: {err}");
+            return HttpResponse::InternalServerError().finish();
+        }
+    };
+    match result {
         Ok(report) => {
             if report.errors.is_empty() {
                 FlashMessage::success(format!(
@@ -231,12 +253,20 @@ pub async fn download_crawler_products(
     user: AuthenticatedUser,
     repo: web::Data<DieselRepository>,
 ) -> impl Responder {
-    match download_crawler_products_service(
-        crawler_id.into_inner(),
-        &params.format,
-        &user,
-        repo.get_ref(),
-    ) {
+    let crawler_id = crawler_id.into_inner();
+    let format = params.into_inner().format;
+    let result = match web::block(move || {
+        download_crawler_products_service(crawler_id, &format, &user, repo.get_ref())
+    })
+    .await
+    {
+        Ok(result) => result,
+        Err(err) => {
+            log::error!("Failed to run crawler products download: {err}");
+            return HttpResponse::InternalServerError().finish();
+        }
+    };
+    match result {
         Ok(file) => HttpResponse::Ok()
             .append_header(("Content-Type", file.content_type))
             .append_header((
@@ -13,7 +13,7 @@ use crate::domain::{
 };
 use crate::forms::benchmarks::{
     AddBenchmarkForm, AddBenchmarkFormPayload, AssociateForm, AssociateFormPayload,
-    UnassociateForm, UnassociateFormPayload, UploadBenchmarksForm, UploadBenchmarksFormPayload,
+    UnassociateForm, UnassociateFormPayload,
 };
 use crate::forms::import_export::{UploadImportForm, UploadMode, UploadTarget, parse_upload};
 use crate::repository::{
@@ -26,6 +26,9 @@ use crate::services::import_export::{
 
 use super::{ServiceError, ServiceResult};
 
+const BENCHMARK_PROCESSING_MESSAGE: &str =
+    "Бенчмарк уже обрабатывается: дождитесь завершения матчинга.";
+
 fn parse_f64(value: &str, field: &str) -> Result<f64, String> {
     value
         .parse::<f64>()
@@ -118,13 +121,13 @@ where
         .into_iter()
         .map(|b| {
             vec![
-                b.sku.as_str().to_string(),
-                b.name.as_str().to_string(),
-                b.category.as_str().to_string(),
-                b.units.as_str().to_string(),
+                b.sku.into_inner(),
+                b.name.into_inner(),
+                b.category.into_inner(),
+                b.units.into_inner(),
                 b.price.get().to_string(),
                 b.amount.get().to_string(),
-                b.description.as_str().to_string(),
+                b.description.into_inner(),
             ]
         })
         .collect::<Vec<_>>();
@@ -275,50 +278,6 @@ where
     }
 }
 
-/// Parses and uploads multiple benchmarks.
-///
-/// Returns `Ok(true)` if benchmarks were created successfully,
-/// `Err(ServiceError::Form(_))` if parsing failed, and `Ok(false)` if the
-/// repository returned an error.
-pub fn upload_benchmarks<R>(
-    form: &mut UploadBenchmarksForm,
-    user: &AuthenticatedUser,
-    repo: &R,
-) -> ServiceResult<bool>
-where
-    R: BenchmarkWriter,
-{
-    if !check_role(SERVICE_ACCESS_ROLE, &user.roles) {
-        return Err(ServiceError::Unauthorized);
-    }
-
-    let payload: UploadBenchmarksFormPayload = match form.try_into() {
-        Ok(payload) => payload,
-        Err(e) => {
-            log::error!("Failed to parse upload benchmarks form: {e}");
-            return Err(ServiceError::Form(e.to_string()));
-        }
-    };
-
-    let hub_id = match HubId::new(user.hub_id) {
-        Ok(hub_id) => hub_id,
-        Err(e) => {
-            log::error!("Invalid hub id in user context: {e}");
-            return Ok(false);
-        }
-    };
-
-    let benchmarks = payload.into_new_benchmarks(hub_id);
-
-    match repo.create_benchmark(&benchmarks) {
-        Ok(_) => Ok(true),
-        Err(e) => {
-            log::error!("Failed to add benchmarks: {e}");
-            Ok(false)
-        }
-    }
-}
-
 /// Upload benchmarks using format/mode-aware import parser and SKU upsert semantics.
 pub fn upload_benchmarks_import<R>(
     form: &mut UploadImportForm,
@@ -348,10 +307,17 @@ where
 {
     let mut report = UploadReport::with_total(parsed.rows.len());
     let mut seen_skus = std::collections::HashSet::new();
+    let mut pending_rows = Vec::new();
+    let mut pending_benchmarks = Vec::new();
+    let mut updated_rows = Vec::new();
+    let mut updated_benchmarks = Vec::new();
 
     for row in parsed.rows {
-        let raw_sku = row.values.get("sku").cloned().unwrap_or_default();
-        let sku_value = raw_sku.trim().to_string();
+        let sku_value = row
+            .values
+            .get("sku")
+            .map(|value| value.trim().to_string())
+            .unwrap_or_default();
         if sku_value.is_empty() {
             report.push_error(row.row_number, None, "Missing sku");
             continue;
@@ -391,7 +357,7 @@ where
             continue;
         }
 
-        let mut merged = row.values.clone();
+        let mut merged = row.values;
         if parsed.mode == UploadMode::Partial
             && let Some(current) = existing.first()
         {
@@ -424,17 +390,8 @@ where
         };
 
         if let Some(current) = existing.first() {
-            match repo.update_benchmark(current.id, &new_benchmark) {
-                Ok(_) => report.updated += 1,
-                Err(err) => {
-                    log::error!("Failed to update benchmark: {err}");
-                    report.push_error(
-                        row.row_number,
-                        Some(sku_value),
-                        "Failed to update benchmark",
-                    );
-                }
-            }
+            updated_rows.push((row.row_number, sku_value));
+            updated_benchmarks.push((current.id, new_benchmark));
             continue;
         }
 
@@ -463,26 +420,32 @@ where
             }
         }
 
-        match repo.create_benchmark(&[new_benchmark]) {
-            Ok(_) => report.created += 1,
-            Err(err) => {
-                log::error!("Failed to create benchmark: {err}");
-                report.push_error(
-                    row.row_number,
-                    Some(sku_value),
-                    "Failed to create benchmark",
-                );
-            }
-        }
+        pending_rows.push((row.row_number, sku_value));
+        pending_benchmarks.push(new_benchmark);
     }
 
+    let updated = report.write_batch(
+        updated_rows,
+        &updated_benchmarks,
+        "Failed to update benchmark",
+        |batch| repo.update_benchmarks(batch),
+    );
+    report.updated += updated;
+    let created = report.write_batch(
+        pending_rows,
+        &pending_benchmarks,
+        "Failed to create benchmark",
+        |batch| repo.create_benchmark(batch),
+    );
+    report.created += created;
+
     Ok(report)
 }
 
 /// Sends a ZMQ message to match the specified benchmark.
 ///
 /// Returns `Ok(true)` if the message was sent successfully, `Ok(false)` if
-/// sending failed.
+/// sending failed, or a form error if the benchmark is already processing.
 pub async fn match_benchmark<R, S>(
     benchmark_id: i32,
     user: &AuthenticatedUser,
@@ -519,6 +482,10 @@ where
         }
     };
 
+    if benchmark.processing {
+        return Err(ServiceError::Form(BENCHMARK_PROCESSING_MESSAGE.to_string()));
+    }
+
     let message = ZMQCrawlerMessage::Benchmark(benchmark.id);
     match sender.send_json(&message).await {
         Ok(_) => Ok(true),
@@ -532,7 +499,8 @@ where
 /// Sends ZMQ messages to update prices for all products associated with a benchmark.
 ///
 /// Returns a list of crawler selectors and whether sending the message for that
-/// crawler succeeded.
+/// crawler succeeded. Crawlers that are already processing are reported as
+/// failed without sending a message.
 pub async fn update_benchmark_prices<R, S>(
     benchmark_id: i32,
     user: &AuthenticatedUser,
@@ -577,29 +545,29 @@ where
         }
     };
 
+    // One query for every crawler in the hub instead of one per crawler.
+    let mut urls_by_crawler = match repo.list_product_urls_by_crawler(
+        ProductListQuery::default()
+            .benchmark(benchmark.id)
+            .hub_id(hub_id),
+    ) {
+        Ok(urls) => urls,
+        Err(e) => {
+            log::error!("Failed to list product urls: {e}");
+            return Err(ServiceError::Internal);
+        }
+    };
+
     let mut results = Vec::new();
     for crawler in crawlers {
-        let products = match repo.list_products(
-            ProductListQuery::default()
-                .benchmark(benchmark.id)
-                .crawler(crawler.id),
-        ) {
-            Ok((_total, products)) => products,
-            Err(e) => {
-                log::error!("Failed to list products: {e}");
-                return Err(ServiceError::Internal);
-            }
+        let Some(urls) = urls_by_crawler.remove(&crawler.id) else {
+            continue;
         };
-
-        if products.is_empty() {
+        if urls.is_empty() {
             continue;
         }
-
-        let urls = products
-            .into_iter()
-            .filter_map(|p| p.url)
-            .collect::<Vec<_>>();
-        if urls.is_empty() {
+        if crawler.processing {
+            results.push((crawler.selector.into_inner(), false));
             continue;
         }
         let message = ZMQCrawlerMessage::Crawler(CrawlerSelector::SelectorProducts((
@@ -956,6 +924,55 @@ mod tests {
         assert_eq!(report.errors.len(), 1);
     }
 
+    #[test]
+    fn benchmark_upload_updates_existing_sku() {
+        let repo = TestRepository::new(vec![], vec![], vec![sample_benchmark()]);
+        let parsed = ParsedUpload {
+            format: UploadFormat::Csv,
+            mode: UploadMode::Partial,
+            headers: vec!["sku".into(), "price".into()],
+            rows: vec![ParsedUploadRow {
+                row_number: 2,
+                values: HashMap::from([
+                    ("sku".into(), "SKU1".into()),
+                    ("price".into(), "10.0".into()),
+                ]),
+            }],
+        };
+
+        let report = apply_benchmark_upload(parsed, HubId::new(1).unwrap(), &repo).unwrap();
+        assert_eq!(report.updated, 1);
+        assert!(report.errors.is_empty());
+    }
+
+    #[test]
+    fn benchmark_upload_creates_new_skus_in_one_batch() {
+        let repo = TestRepository::new(vec![], vec![], vec![]);
+        let row = |row_number: usize, sku: &str| ParsedUploadRow {
+            row_number,
+            values: HashMap::from([
+                ("sku".into(), sku.into()),
+                ("name".into(), "benchmark".into()),
+                ("category".into(), "category".into()),
+                ("units".into(), "pcs".into()),
+                ("price".into(), "10.0".into()),
+                ("amount".into(), "1.0".into()),
+                ("description".into(), "desc".into()),
+            ]),
+        };
+        let parsed = ParsedUpload {
+            format: UploadFormat::Csv,
+            mode: UploadMode::Full,
+            headers: vec![],
+            rows: vec![row(2, "SKU1"), row(3, "SKU2")],
+        };
+
+        let report = apply_benchmark_upload(parsed, HubId::new(1).unwrap(), &repo).unwrap();
+        assert_eq!(report.created, 2);
+        assert!(report.errors.is_empty());
+        assert_eq!(repo.benchmark_writes(), vec![2]);
+    }
+
     struct NoopSender;
 
     impl ZmqSenderTrait for NoopSender {
@@ -985,4 +1002,34 @@ mod tests {
             .unwrap();
         assert!(results.is_empty());
     }
+
+    #[actix_web::test]
+    async fn update_benchmark_prices_reports_processing_crawler_as_failed() {
+        let mut crawler = sample_crawler();
+        crawler.processing = true;
+        let repo = TestRepository::new(
+            vec![crawler],
+            vec![sample_product()],
+            vec![sample_benchmark()],
+        );
+        let user = sample_user();
+        let sender = NoopSender;
+
+        let results = update_benchmark_prices(1, &user, &repo, &sender)
+            .await
+            .unwrap();
+        assert_eq!(results, vec![("body".to_string(), false)]);
+    }
+
+    #[actix_web::test]
+    async fn match_benchmark_refuses_benchmark_that_is_processing() {
+        let mut benchmark = sample_benchmark();
+        benchmark.processing = true;
+        let repo = TestRepository::new(vec![], vec![], vec![benchmark]);
+        let user = sample_user();
+        let sender = NoopSender;
+
+        let result = match_benchmark(1, &user, &repo, &sender).await;
+        assert!(matches!(result, Err(ServiceError::Form(_))));
+    }
 }
@@ -1,3 +1,5 @@
+use std::borrow::Cow;
+
 use serde::Serialize;
 use thiserror::Error;
 
@@ -40,6 +42,45 @@ impl UploadReport {
             message: message.into(),
         });
     }
+
+    /// Writes deferred upload rows with one batched call and returns how many
+    /// were written.
+    ///
+    /// A failed batch is rolled back as a whole, so each item is replayed on
+    /// its own and only the rows that still fail are reported, with `message`.
+    /// `rows` holds the `(row_number, sku)` of each item in `items`.
+    pub fn write_batch<T, E>(
+        &mut self,
+        rows: Vec<(usize, String)>,
+        items: &[T],
+        message: &str,
+        mut write: impl FnMut(&[T]) -> Result<usize, E>,
+    ) -> usize
+    where
+        E: std::fmt::Display,
+    {
+        if items.is_empty() {
+            return 0;
+        }
+
+        match write(items) {
+            Ok(_) => return items.len(),
+            Err(err) => log::error!("{message} (batch): {err}"),
+        }
+
+        let mut written = 0;
+        for ((row_number, sku), item) in rows.into_iter().zip(items) {
+            match write(std::slice::from_ref(item)) {
+                Ok(_) => written += 1,
+                Err(err) => {
+                    log::error!("{message}: {err}");
+                    self.push_error(row_number, Some(sku), message);
+                }
+            }
+        }
+        self.errors.sort_by_key(|error| error.row_number);
+        written
+    }
 }
 
 #[derive(Debug, Clone, Copy, PartialEq, Eq)]
@@ -52,10 +93,13 @@ impl TryFrom<&str> for DownloadFormat {
     type Error = DownloadError;
 
     fn try_from(value: &str) -> Result<Self, Self::Error> {
-        match value.trim().to_ascii_lowercase().as_str() {
-            "csv" => Ok(Self::Csv),
-            "xlsx" => Ok(Self::Xlsx),
-            other => Err(DownloadError::InvalidFormat(other.to_string())),
+        let value = value.trim();
+        if value.eq_ignore_ascii_case("csv") {
+            Ok(Self::Csv)
+        } else if value.eq_ignore_ascii_case("xlsx") {
+            Ok(Self::Xlsx)
+        } else {
+            Err(DownloadError::InvalidFormat(value.to_ascii_lowercase()))
         }
     }
 }
@@ -85,15 +129,25 @@ pub fn render_download_file(
 ) -> Result<DownloadFile, DownloadError> {
     match format {
         DownloadFormat::Csv => {
-            let mut writer = csv::Writer::from_writer(vec![]);
+            // Size the output up front so large exports do not regrow the buffer.
+            let capacity = headers.iter().map(|header| header.len() + 1).sum::<usize>()
+                + rows
+                    .iter()
+                    .map(|row| row.iter().map(|value| value.len() + 1).sum::<usize>())
+                    .sum::<usize>();
+            let mut writer = csv::Writer::from_writer(Vec::with_capacity(capacity));
             writer
                 .write_record(headers)
                 .map_err(|_| DownloadError::CsvRender)?;
             for row in rows {
-                let escaped_row: Vec<String> =
-                    row.iter().map(|value| escape_csv_cell(value)).collect();
+                // Write cells one by one so unescaped values are never copied.
+                for value in row {
+                    writer
+                        .write_field(&*escape_csv_cell(value))
+                        .map_err(|_| DownloadError::CsvRender)?;
+                }
                 writer
-                    .write_record(&escaped_row)
+                    .write_record(None::<&[u8]>)
                     .map_err(|_| DownloadError::CsvRender)?;
             }
             let bytes = writer.into_inner().map_err(|_| DownloadError::CsvRender)?;
@@ -134,17 +188,17 @@ pub fn render_download_file(
     }
 }
 
-fn escape_csv_cell(value: &str) -> String {
+fn escape_csv_cell(value: &str) -> Cow<'_, str> {
     let mut chars = value.chars();
     match chars.next() {
-        Some('=' | '+' | '-' | '@') => format!("'{value}"),
-        _ => value.to_string(),
+        Some('=' | '+' | '-' | '@') => Cow::Owned(format!("'{value}")),
+        _ => Cow::Borrowed(value),
     }
 }
 
 #[cfg(test)]
 mod tests {
-    use super::{DownloadFormat, render_download_file};
+    use super::{DownloadFormat, UploadReport, render_download_file};
 
     #[test]
     fn csv_export_escapes_formula_prefixed_cells() {
@@ -178,4 +232,66 @@ mod tests {
         assert!(csv_output.contains("SKU-123"));
         assert!(csv_output.contains("https://example.com"));
     }
+
+    #[test]
+    fn csv_export_quotes_cells_with_delimiters() {
+        let file = render_download_file(
+            "products",
+            DownloadFormat::Csv,
+            &["sku", "name"],
+            &[vec!["SKU-1".to_string(), "Tea, \"green\"".to_string()]],
+        )
+        .expect("csv render should succeed");
+
+        let csv_output = String::from_utf8(file.bytes).expect("csv output should be utf-8");
+        assert_eq!(csv_output, "sku,name\nSKU-1,\"Tea, \"\"green\"\"\"\n");
+    }
+
+    #[test]
+    fn write_batch_replays_failed_batch_row_by_row() {
+        let mut report = UploadReport::with_total(4);
+        report.push_error(5, Some("E".to_string()), "Invalid row");
+        let rows = vec![
+            (2, "A".to_string()),
+            (3, "B".to_string()),
+            (4, "C".to_string()),
+        ];
+        let mut calls = 0;
+
+        let written = report.write_batch(rows, &["A", "B", "C"], "Failed to write", |batch| {
+            calls += 1;
+            if batch.contains(&"B") {
+                Err("conflict")
+            } else {
+                Ok(batch.len())
+            }
+        });
+
+        assert_eq!(written, 2);
+        assert_eq!(calls, 4);
+        let rows = report
+            .errors
+            .iter()
+            .map(|error| (error.row_number, error.sku.as_deref()))
+            .collect::<Vec<_>>();
+        assert_eq!(rows, vec![(3, Some("B")), (5, Some("E"))]);
+        assert_eq!(report.errors[0].message, "Failed to write");
+        assert_eq!(report.skipped, 2);
+    }
+
+    #[test]
+    fn write_batch_writes_once_when_batch_succeeds() {
+        let mut report = UploadReport::with_total(2);
+        let rows = vec![(2, "A".to_string()), (3, "B".to_string())];
+        let mut calls = 0;
+
+        let written = report.write_batch(rows, &["A", "B"], "Failed to write", |batch| {
+            calls += 1;
+            Ok::<usize, String>(batch.len())
+        });
+
+        assert_eq!(written, 2);
+        assert_eq!(calls, 1);
+        assert!(report.errors.is_empty());
+    }
 }
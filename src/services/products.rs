@@ -1,4 +1,3 @@
-use chrono::Utc;
 use pushkind_common::domain::auth::AuthenticatedUser;
 use pushkind_common::pagination::{DEFAULT_ITEMS_PER_PAGE, Paginated};
 use pushkind_common::routes::check_role;
@@ -6,7 +5,9 @@ use pushkind_common::zmq::ZmqSenderExt;
 
 use crate::SERVICE_ACCESS_ROLE;
 use crate::domain::product::NewProduct;
-use crate::domain::types::{CrawlerId, HubId};
+use crate::domain::types::{
+    CategoryName, CrawlerId, HubId, ProductDescription, ProductUnits, ProductUrl,
+};
 use crate::domain::zmq::{CrawlerSelector, ZMQCrawlerMessage};
 use crate::domain::{crawler::Crawler, product::Product};
 use crate::forms::import_export::{UploadImportForm, UploadMode, UploadTarget, parse_upload};
@@ -17,6 +18,8 @@ use crate::services::import_export::{
 
 use super::{ServiceError, ServiceResult};
 
+const CRAWLER_PROCESSING_MESSAGE: &str = "Парсер уже выполняет обработку: дождитесь её завершения.";
+
 fn parse_required_f64(value: Option<&String>, field: &str) -> Result<f64, String> {
     value
         .map(String::as_str)
@@ -85,7 +88,6 @@ fn build_product_from_row(
         .transpose()
         .map_err(|err| err.to_string())?;
 
-    let _now = Utc::now().naive_utc();
     Ok(NewProduct {
         crawler_id,
         name,
@@ -191,26 +193,16 @@ where
         .into_iter()
         .map(|p| {
             vec![
-                p.sku.as_str().to_string(),
-                p.name.as_str().to_string(),
-                p.category
-                    .as_ref()
-                    .map(|v| v.as_str().to_string())
-                    .unwrap_or_default(),
-                p.units
-                    .as_ref()
-                    .map(|v| v.as_str().to_string())
-                    .unwrap_or_default(),
+                p.sku.into_inner(),
+                p.name.into_inner(),
+                p.category.map(CategoryName::into_inner).unwrap_or_default(),
+                p.units.map(ProductUnits::into_inner).unwrap_or_default(),
                 p.price.get().to_string(),
                 p.amount.map(|v| v.get().to_string()).unwrap_or_default(),
                 p.description
-                    .as_ref()
-                    .map(|v| v.as_str().to_string())
-                    .unwrap_or_default(),
-                p.url
-                    .as_ref()
-                    .map(|v| v.as_str().to_string())
+                    .map(ProductDescription::into_inner)
                     .unwrap_or_default(),
+                p.url.map(ProductUrl::into_inner).unwrap_or_default(),
             ]
         })
         .collect::<Vec<_>>();
@@ -238,7 +230,8 @@ where
 /// Validates the `parser` role, ensures the crawler belongs to the user's hub
 /// and sends a ZMQ message to trigger crawling. Returns `Ok(true)` if the
 /// message was sent successfully, `Ok(false)` if sending failed, or an error if
-/// the crawler was not found or a repository error occurred.
+/// the crawler was not found, is already processing or a repository error
+/// occurred.
 pub async fn crawl_crawler<R, S>(
     crawler_id: i32,
     user: &AuthenticatedUser,
@@ -275,6 +268,10 @@ where
         }
     };
 
+    if crawler.processing {
+        return Err(ServiceError::Form(CRAWLER_PROCESSING_MESSAGE.to_string()));
+    }
+
     let message = ZMQCrawlerMessage::Crawler(CrawlerSelector::Selector(crawler.selector));
     match sender.send_json(&message).await {
         Ok(_) => Ok(true),
@@ -328,18 +325,18 @@ where
         }
     };
 
-    let products = match repo.list_products(ProductListQuery::default().crawler(crawler_id)) {
-        Ok((_total, products)) => products,
+    if crawler.processing {
+        return Err(ServiceError::Form(CRAWLER_PROCESSING_MESSAGE.to_string()));
+    }
+
+    let urls = match repo.list_product_urls(ProductListQuery::default().crawler(crawler_id)) {
+        Ok(urls) => urls,
         Err(e) => {
-            log::error!("Failed to get products: {e}");
+            log::error!("Failed to get product urls: {e}");
             return Err(ServiceError::Internal);
         }
     };
 
-    let urls = products
-        .into_iter()
-        .filter_map(|p| p.url)
-        .collect::<Vec<_>>();
     if urls.is_empty() {
         return Ok(false);
     }
@@ -396,15 +393,17 @@ where
 {
     let mut report = UploadReport::with_total(parsed.rows.len());
     let mut seen_skus = std::collections::HashSet::new();
+    let mut pending_rows = Vec::new();
+    let mut pending_products = Vec::new();
+    let mut updated_rows = Vec::new();
+    let mut updated_products = Vec::new();
 
     for row in parsed.rows {
         let sku_value = row
             .values
             .get("sku")
-            .cloned()
-            .unwrap_or_default()
-            .trim()
-            .to_string();
+            .map(|value| value.trim().to_string())
+            .unwrap_or_default();
         if sku_value.is_empty() {
             report.push_error(row.row_number, None, "Missing sku");
             continue;
@@ -442,7 +441,7 @@ where
             continue;
         }
 
-        let mut merged = row.values.clone();
+        let mut merged = row.values;
         if parsed.mode == UploadMode::Partial
             && let Some(current) = existing.first()
         {
@@ -512,13 +511,8 @@ where
         };
 
         if let Some(current) = existing.first() {
-            match repo.update_product(current.id, &new_product) {
-                Ok(_) => report.updated += 1,
-                Err(err) => {
-                    log::error!("Failed to update product: {err}");
-                    report.push_error(row.row_number, Some(sku_value), "Failed to update product");
-                }
-            }
+            updated_rows.push((row.row_number, sku_value));
+            updated_products.push((current.id, new_product));
             continue;
         }
 
@@ -539,15 +533,25 @@ where
             }
         }
 
-        match repo.create_product(&new_product) {
-            Ok(_) => report.created += 1,
-            Err(err) => {
-                log::error!("Failed to create product: {err}");
-                report.push_error(row.row_number, Some(sku_value), "Failed to create product");
-            }
-        }
+        pending_rows.push((row.row_number, sku_value));
+        pending_products.push(new_product);
     }
 
+    let updated = report.write_batch(
+        updated_rows,
+        &updated_products,
+        "Failed to update product",
+        |batch| repo.update_products(batch),
+    );
+    report.updated += updated;
+    let created = report.write_batch(
+        pending_rows,
+        &pending_products,
+        "Failed to create product",
+        |batch| repo.create_products(batch),
+    );
+    report.created += created;
+
     Ok(report)
 }
 
@@ -661,6 +665,73 @@ mod tests {
         assert_eq!(report.errors.len(), 1);
     }
 
+    #[test]
+    fn crawler_upload_updates_existing_skus_in_one_batch() {
+        let mut p2 = sample_product();
+        p2.id = ProductId::new(2).unwrap();
+        p2.sku = ProductSku::new("SKU2").unwrap();
+        let repo = TestRepository::new(vec![sample_crawler()], vec![sample_product(), p2], vec![]);
+        let parsed = ParsedUpload {
+            format: UploadFormat::Csv,
+            mode: UploadMode::Partial,
+            headers: vec!["sku".into(), "price".into()],
+            rows: vec![
+                ParsedUploadRow {
+                    row_number: 2,
+                    values: HashMap::from([
+                        ("sku".into(), "SKU1".into()),
+                        ("price".into(), "10.0".into()),
+                    ]),
+                },
+                ParsedUploadRow {
+                    row_number: 3,
+                    values: HashMap::from([
+                        ("sku".into(), "SKU2".into()),
+                        ("price".into(), "20.0".into()),
+                    ]),
+                },
+            ],
+        };
+
+        let report = apply_crawler_upload(parsed, CrawlerId::new(1).unwrap(), &repo).unwrap();
+        assert_eq!(report.updated, 2);
+        assert!(report.errors.is_empty());
+        assert_eq!(repo.product_writes(), vec![2]);
+    }
+
+    #[test]
+    fn crawler_upload_creates_new_skus_in_one_batch() {
+        let repo = TestRepository::new(vec![sample_crawler()], vec![], vec![]);
+        let parsed = ParsedUpload {
+            format: UploadFormat::Csv,
+            mode: UploadMode::Full,
+            headers: vec!["sku".into(), "name".into(), "price".into()],
+            rows: vec![
+                ParsedUploadRow {
+                    row_number: 2,
+                    values: HashMap::from([
+                        ("sku".into(), "SKU1".into()),
+                        ("name".into(), "first".into()),
+                        ("price".into(), "10.0".into()),
+                    ]),
+                },
+                ParsedUploadRow {
+                    row_number: 3,
+                    values: HashMap::from([
+                        ("sku".into(), "SKU2".into()),
+                        ("name".into(), "second".into()),
+                        ("price".into(), "20.0".into()),
+                    ]),
+                },
+            ],
+        };
+
+        let report = apply_crawler_upload(parsed, CrawlerId::new(1).unwrap(), &repo).unwrap();
+        assert_eq!(report.created, 2);
+        assert!(report.errors.is_empty());
+        assert_eq!(repo.product_writes(), vec![2]);
+    }
+
     struct NoopSender;
 
     impl ZmqSenderTrait for NoopSender {
@@ -690,4 +761,28 @@ mod tests {
             .unwrap();
         assert!(!sent);
     }
+
+    #[actix_web::test]
+    async fn crawl_crawler_refuses_crawler_that_is_processing() {
+        let mut crawler = sample_crawler();
+        crawler.processing = true;
+        let repo = TestRepository::new(vec![crawler], vec![], vec![]);
+        let user = sample_user();
+        let sender = NoopSender;
+
+        let result = crawl_crawler(1, &user, &repo, &sender).await;
+        assert!(matches!(result, Err(ServiceError::Form(_))));
+    }
+
+    #[actix_web::test]
+    async fn update_crawler_prices_refuses_crawler_that_is_processing() {
+        let mut crawler = sample_crawler();
+        crawler.processing = true;
+        let repo = TestRepository::new(vec![crawler], vec![sample_product()], vec![]);
+        let user = sample_user();
+        let sender = NoopSender;
+
+        let result = update_crawler_prices(1, &user, &repo, &sender).await;
+        assert!(matches!(result, Err(ServiceError::Form(_))));
+    }
 }
@@ -1,13 +1,21 @@
+use std::io::Write;
+
+use actix_multipart::form::{tempfile::TempFile, text::Text};
 use chrono::Utc;
 use diesel::prelude::*;
+use pushkind_common::domain::auth::AuthenticatedUser;
+use pushkind_dantes::SERVICE_ACCESS_ROLE;
 use pushkind_dantes::domain::category::NewCategory;
 use pushkind_dantes::domain::types::{
-    CategoryAssignmentSource, CategoryName, HubId, ProductId, ProductUrl,
+    BenchmarkId, CategoryAssignmentSource, CategoryName, CrawlerId, HubId, ProductId, ProductUrl,
 };
+use pushkind_dantes::forms::import_export::UploadImportForm;
 use pushkind_dantes::repository::{
-    CategoryListQuery, CategoryReader, CategoryWriter, DieselRepository, ProductWriter,
+    CategoryListQuery, CategoryReader, CategoryWriter, DieselRepository, ProductListQuery,
+    ProductReader, ProductWriter,
 };
-use pushkind_dantes::schema::products;
+use pushkind_dantes::schema::{benchmarks, crawlers, product_benchmark, product_images, products};
+use pushkind_dantes::services::products::upload_crawler_products;
 
 mod common;
 
@@ -82,6 +90,71 @@ fn delete_category_resets_linked_products_to_automatic() {
     assert_eq!(row.1, CategoryAssignmentSource::Automatic.as_str());
 }
 
+#[test]
+fn paginated_category_list_reports_total_for_every_page() {
+    let test_db = common::TestDb::new();
+    let repo = DieselRepository::new(test_db.pool());
+
+    let hub_id = HubId::new(1).expect("valid hub id");
+    let now = Utc::now().naive_utc();
+    for name in ["Tea/Black", "Tea/Green", "Tea/White"] {
+        let new_category = NewCategory {
+            hub_id,
+            name: CategoryName::new(name.to_string()).expect("valid category name"),
+            embedding: None,
+            created_at: now,
+            updated_at: now,
+        };
+        repo.create_category(&new_category)
+            .expect("should create category");
+    }
+
+    // Full page, partial last page and a page past the end.
+    for (page, expected_len) in [(1, 2), (2, 1), (3, 0)] {
+        let (total, categories) = repo
+            .list_categories(CategoryListQuery::new(hub_id).paginate(page, 2))
+            .expect("should list categories");
+        assert_eq!(total, 3, "total for page {page}");
+        assert_eq!(categories.len(), expected_len, "rows for page {page}");
+    }
+}
+
+#[test]
+fn paginated_product_list_reports_total_for_every_page() {
+    let test_db = common::TestDb::new();
+    let repo = DieselRepository::new(test_db.pool());
+    let mut conn = test_db
+        .pool()
+        .get()
+        .expect("should acquire DB connection for setup");
+
+    for sku in ["PAGE-1", "PAGE-2", "PAGE-3"] {
+        diesel::insert_into(products::table)
+            .values((
+                products::crawler_id.eq(1),
+                products::name.eq(sku),
+                products::sku.eq(sku),
+                products::price.eq(1.0_f64),
+            ))
+            .execute(&mut conn)
+            .expect("should create product");
+    }
+
+    let crawler_id = CrawlerId::new(1).expect("valid crawler id");
+    // Full page, partial last page and a page past the end.
+    for (page, expected_len) in [(1, 2), (2, 1), (3, 0)] {
+        let (total, products) = repo
+            .list_products(
+                ProductListQuery::default()
+                    .crawler(crawler_id)
+                    .paginate(page, 2),
+            )
+            .expect("should list products");
+        assert_eq!(total, 3, "total for page {page}");
+        assert_eq!(products.len(), expected_len, "rows for page {page}");
+    }
+}
+
 #[test]
 fn migration_allows_null_product_urls() {
     let test_db = common::TestDb::new();
@@ -134,3 +207,376 @@ fn non_null_product_urls_remain_unique_per_crawler() {
 
     assert!(duplicate_insert.is_err());
 }
+
+#[test]
+fn deleting_product_cascades_to_benchmark_links_and_images() {
+    let test_db = common::TestDb::new();
+    let mut conn = test_db
+        .pool()
+        .get()
+        .expect("should acquire DB connection for setup");
+
+    diesel::insert_into(products::table)
+        .values((
+            products::crawler_id.eq(1),
+            products::name.eq("Cascade Product"),
+            products::sku.eq("SKU-CASCADE-1"),
+            products::price.eq(10.0_f64),
+            products::url.eq(Some("https://example.com/cascade")),
+        ))
+        .execute(&mut conn)
+        .expect("should create product");
+    let product_id: i32 = products::table
+        .filter(products::sku.eq("SKU-CASCADE-1"))
+        .select(products::id)
+        .first(&mut conn)
+        .expect("inserted product id should be readable");
+
+    diesel::insert_into(benchmarks::table)
+        .values((
+            benchmarks::hub_id.eq(1),
+            benchmarks::name.eq("Cascade Benchmark"),
+            benchmarks::sku.eq("BENCH-CASCADE-1"),
+            benchmarks::category.eq("Tea"),
+            benchmarks::units.eq("pcs"),
+            benchmarks::price.eq(12.0_f64),
+            benchmarks::amount.eq(1.0_f64),
+            benchmarks::description.eq("Benchmark"),
+        ))
+        .execute(&mut conn)
+        .expect("should create benchmark");
+    let benchmark_id: i32 = benchmarks::table
+        .filter(benchmarks::sku.eq("BENCH-CASCADE-1"))
+        .select(benchmarks::id)
+        .first(&mut conn)
+        .expect("inserted benchmark id should be readable");
+
+    diesel::insert_into(product_benchmark::table)
+        .values((
+            product_benchmark::product_id.eq(product_id),
+            product_benchmark::benchmark_id.eq(benchmark_id),
+            product_benchmark::distance.eq(0.9_f32),
+        ))
+        .execute(&mut conn)
+        .expect("should create association");
+    diesel::insert_into(product_images::table)
+        .values((
+            product_images::product_id.eq(product_id),
+            product_images::url.eq("https://example.com/cascade.png"),
+        ))
+        .execute(&mut conn)
+        .expect("should create image");
+
+    diesel::delete(products::table.filter(products::id.eq(product_id)))
+        .execute(&mut conn)
+        .expect("product delete should succeed without manual cleanup");
+
+    let links: i64 = product_benchmark::table
+        .count()
+        .get_result(&mut conn)
+        .expect("should count associations");
+    let images: i64 = product_images::table
+        .count()
+        .get_result(&mut conn)
+        .expect("should count images");
+    assert_eq!(links, 0);
+    assert_eq!(images, 0);
+}
+
+fn parser_user() -> AuthenticatedUser {
+    AuthenticatedUser {
+        sub: "1".into(),
+        email: "test@example.com".into(),
+        hub_id: 1,
+        name: "Test".into(),
+        roles: vec![SERVICE_ACCESS_ROLE.into()],
+        exp: 0,
+    }
+}
+
+fn csv_upload(content: &str) -> UploadImportForm {
+    let mut file = tempfile::NamedTempFile::new().expect("should create upload temp file");
+    file.write_all(content.as_bytes())
+        .expect("should write upload temp file");
+    UploadImportForm {
+        file: TempFile {
+            file,
+            content_type: None,
+            file_name: Some("products.csv".to_string()),
+            size: content.len(),
+        },
+        format: Text("csv".to_string()),
+        mode: Text("full".to_string()),
+    }
+}
+
+#[test]
+fn crawler_upload_replays_rejected_batch_row_by_row() {
+    let test_db = common::TestDb::new();
+    let repo = DieselRepository::new(test_db.pool());
+
+    // Rows 2 and 3 share a url, so the batched insert hits the unique
+    // (crawler_id, url) index; row 4 fails validation before any write.
+    let mut form = csv_upload(
+        "sku,name,category,units,price,amount,description,url\n\
+         SKU-A,Product A,,,10,,,https://example.com/shared\n\
+         SKU-B,Product B,,,20,,,https://example.com/shared\n\
+         SKU-C,Product C,,,not-a-price,,,https://example.com/c\n\
+         SKU-D,Product D,,,40,,,https://example.com/d\n",
+    );
+
+    let report = upload_crawler_products(1, &mut form, &parser_user(), &repo)
+        .expect("upload should produce a report");
+
+    assert_eq!(report.created, 2);
+    let errors = report
+        .errors
+        .iter()
+        .map(|error| {
+            (
+                error.row_number,
+                error.sku.as_deref(),
+                error.message.as_str(),
+            )
+        })
+        .collect::<Vec<_>>();
+    assert_eq!(errors[0], (3, Some("SKU-B"), "Failed to create product"));
+    assert_eq!(errors[1].0, 4);
+    assert_eq!(errors.len(), 2);
+
+    let mut conn = test_db
+        .pool()
+        .get()
+        .expect("should acquire DB connection for assertions");
+    let skus: Vec<String> = products::table
+        .filter(products::crawler_id.eq(1))
+        .select(products::sku)
+        .order(products::sku.asc())
+        .load(&mut conn)
+        .expect("products should be readable");
+    assert_eq!(skus, vec!["SKU-A", "SKU-D"]);
+}
+
+/// Seeds two benchmarks and products across both hubs for URL query tests.
+///
+/// Crawlers 1 and 2 are seeded by migrations in hub 1; crawler 100 is added in
+/// hub 2. Returns the ids of the two hub 1 benchmarks.
+fn seed_url_fixture(conn: &mut SqliteConnection) -> (BenchmarkId, BenchmarkId) {
+    diesel::insert_into(crawlers::table)
+        .values((
+            crawlers::id.eq(100),
+            crawlers::hub_id.eq(2),
+            crawlers::name.eq("other-hub"),
+            crawlers::url.eq("https://other.example.com"),
+            crawlers::selector.eq("other-hub"),
+        ))
+        .execute(conn)
+        .expect("should create hub 2 crawler");
+
+    let mut benchmark_ids = Vec::new();
+    for sku in ["BENCH-URL-1", "BENCH-URL-2"] {
+        diesel::insert_into(benchmarks::table)
+            .values((
+                benchmarks::hub_id.eq(1),
+                benchmarks::name.eq(sku),
+                benchmarks::sku.eq(sku),
+                benchmarks::category.eq("Tea"),
+                benchmarks::units.eq("pcs"),
+                benchmarks::price.eq(10.0_f64),
+                benchmarks::amount.eq(1.0_f64),
+                benchmarks::description.eq("Benchmark"),
+            ))
+            .execute(conn)
+            .expect("should create benchmark");
+        let id: i32 = benchmarks::table
+            .filter(benchmarks::sku.eq(sku))
+            .select(benchmarks::id)
+            .first(conn)
+            .expect("inserted benchmark id should be readable");
+        benchmark_ids.push(id);
+    }
+    let (first, second) = (benchmark_ids[0], benchmark_ids[1]);
+
+    // (crawler, sku, url, linked benchmark)
+    let rows = [
+        (1, "URL-1", Some("https://example.com/1"), Some(first)),
+        (1, "URL-2", None, Some(first)),
+        (1, "URL-3", Some("https://example.com/3"), Some(second)),
+        (1, "URL-4", Some("https://example.com/4"), None),
+        (2, "URL-5", Some("https://example.com/5"), Some(first)),
+        (
+            100,
+            "URL-6",
+            Some("https://other.example.com/6"),
+            Some(first),
+        ),
+    ];
+    for (crawler_id, sku, url, benchmark_id) in rows {
+        diesel::insert_into(products::table)
+            .values((
+                products::crawler_id.eq(crawler_id),
+                products::name.eq(sku),
+                products::sku.eq(sku),
+                products::price.eq(1.0_f64),
+                products::url.eq(url),
+            ))
+            .execute(conn)
+            .expect("should create product");
+        let Some(benchmark_id) = benchmark_id else {
+            continue;
+        };
+        let product_id: i32 = products::table
+            .filter(products::sku.eq(sku))
+            .select(products::id)
+            .first(conn)
+            .expect("inserted product id should be readable");
+        diesel::insert_into(product_benchmark::table)
+            .values((
+                product_benchmark::product_id.eq(product_id),
+                product_benchmark::benchmark_id.eq(benchmark_id),
+                product_benchmark::distance.eq(0.1_f32),
+            ))
+            .execute(conn)
+            .expect("should link product to benchmark");
+    }
+
+    (
+        BenchmarkId::new(first).expect("valid benchmark id"),
+        BenchmarkId::new(second).expect("valid benchmark id"),
+    )
+}
+
+fn sorted_urls(urls: Vec<ProductUrl>) -> Vec<String> {
+    let mut urls = urls
+        .into_iter()
+        .map(ProductUrl::into_inner)
+        .collect::<Vec<_>>();
+    urls.sort();
+    urls
+}
+
+#[test]
+fn list_product_urls_applies_filters_and_skips_null_urls() {
+    let test_db = common::TestDb::new();
+    let repo = DieselRepository::new(test_db.pool());
+    let mut conn = test_db
+        .pool()
+        .get()
+        .expect("should acquire DB connection for setup");
+    let (first, _second) = seed_url_fixture(&mut conn);
+    let crawler_id = CrawlerId::new(1).expect("valid crawler id");
+
+    let urls = repo
+        .list_product_urls(ProductListQuery::default().crawler(crawler_id))
+        .expect("should list crawler urls");
+    assert_eq!(
+        sorted_urls(urls),
+        vec![
+            "https://example.com/1",
+            "https://example.com/3",
+            "https://example.com/4",
+        ]
+    );
+
+    let urls = repo
+        .list_product_urls(
+            ProductListQuery::default()
+                .crawler(crawler_id)
+                .benchmark(first),
+        )
+        .expect("should list benchmark urls");
+    assert_eq!(sorted_urls(urls), vec!["https://example.com/1"]);
+
+    let urls = repo
+        .list_product_urls(
+            ProductListQuery::default()
+                .benchmark(first)
+                .hub_id(HubId::new(2).expect("valid hub id")),
+        )
+        .expect("should list hub urls");
+    assert_eq!(sorted_urls(urls), vec!["https://other.example.com/6"]);
+}
+
+#[test]
+fn list_product_urls_by_crawler_groups_hub_scoped_benchmark_urls() {
+    let test_db = common::TestDb::new();
+    let repo = DieselRepository::new(test_db.pool());
+    let mut conn = test_db
+        .pool()
+        .get()
+        .expect("should acquire DB connection for setup");
+    let (first, second) = seed_url_fixture(&mut conn);
+    let hub_id = HubId::new(1).expect("valid hub id");
+
+    let mut urls = repo
+        .list_product_urls_by_crawler(ProductListQuery::default().benchmark(first).hub_id(hub_id))
+        .expect("should group benchmark urls");
+    let mut crawler_ids = urls.keys().map(|id| id.get()).collect::<Vec<_>>();
+    crawler_ids.sort();
+    // Hub 2's crawler 100 is linked to the benchmark but must not appear.
+    assert_eq!(crawler_ids, vec![1, 2]);
+    let first_crawler = urls
+        .remove(&CrawlerId::new(1).expect("valid crawler id"))
+        .expect("crawler 1 urls");
+    assert_eq!(sorted_urls(first_crawler), vec!["https://example.com/1"]);
+    let second_crawler = urls
+        .remove(&CrawlerId::new(2).expect("valid crawler id"))
+        .expect("crawler 2 urls");
+    assert_eq!(sorted_urls(second_crawler), vec!["https://example.com/5"]);
+
+    let urls = repo
+        .list_product_urls_by_crawler(ProductListQuery::default().benchmark(second).hub_id(hub_id))
+        .expect("should group second benchmark urls");
+    assert_eq!(urls.len(), 1);
+    assert_eq!(
+        sorted_urls(urls[&CrawlerId::new(1).expect("valid crawler id")].clone()),
+        vec!["https://example.com/3"]
+    );
+}
+
+#[test]
+fn list_and_search_products_do_not_load_embeddings() {
+    let test_db = common::TestDb::new();
+    let repo = DieselRepository::new(test_db.pool());
+    let mut conn = test_db
+        .pool()
+        .get()
+        .expect("should acquire DB connection for setup");
+
+    diesel::insert_into(products::table)
+        .values((
+            products::crawler_id.eq(1),
+            products::name.eq("Embedded Oolong"),
+            products::sku.eq("SKU-EMBED-1"),
+            products::price.eq(15.0_f64),
+            products::url.eq(Some("https://example.com/embedded")),
+            products::embedding.eq(Some(vec![1_u8, 2, 3, 4])),
+        ))
+        .execute(&mut conn)
+        .expect("should create product with embedding");
+    let crawler_id = CrawlerId::new(1).expect("valid crawler id");
+
+    let (total, listed) = repo
+        .list_products(ProductListQuery::default().crawler(crawler_id))
+        .expect("should list products");
+    assert_eq!(total, 1);
+    assert_eq!(listed[0].name.as_str(), "Embedded Oolong");
+    assert!(listed[0].embedding.is_none());
+
+    let (total, found) = repo
+        .search_products(
+            ProductListQuery::default()
+                .crawler(crawler_id)
+                .search("Embedded"),
+        )
+        .expect("should search products");
+    assert_eq!(total, 1);
+    assert_eq!(found[0].sku.as_str(), "SKU-EMBED-1");
+    assert!(found[0].embedding.is_none());
+
+    let stored = repo
+        .get_product_by_id(listed[0].id)
+        .expect("should load product")
+        .expect("product should exist");
+    assert_eq!(stored.embedding, Some(vec![1, 2, 3, 4]));
+}